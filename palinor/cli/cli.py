@@ -2,24 +2,54 @@
 Command-line interface for cli.
 """
 
+import os
+import re
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import click
-from IPython import start_ipython
 from rich.console import Console
-from rich.traceback import install as rich_traceback_install
-from palinor.manager import palinorManager
-from palinor.create_dataset import create_personality_prompts, save_prompts
+from palinor.create_dataset import create_and_save
 from palinor import create_dataset
 
-rich_traceback_install()
+if TYPE_CHECKING:
+    from palinor.manager import palinorManager
+
+# Heavy imports (IPython, torch via palinorManager) are deferred into the
+# commands that need them so that light commands like `dataset` start fast.
+if os.environ.get("PALINOR_RICH_TB"):
+    from rich.traceback import install as rich_traceback_install
+
+    rich_traceback_install()
+
 console = Console()
 
+_MARKUP_RE = re.compile(r"\[/?[^\]]+\]")
+
+
+def _plain_log(*args: object) -> None:
+    """Print with Rich markup stripped, skipping Rich's render pipeline."""
+    print(*[_MARKUP_RE.sub("", str(a)) for a in args])
+
+
+# Rich's markup parser and style engine are wasted work when output is piped;
+# route command status lines through plain print for non-TTY stdout.
+_IS_TTY = sys.stdout.isatty()
+_LOG = console.print if _IS_TTY else _plain_log
+
+_DATASETS_DIR = Path.home() / ".palinor" / "datasets"
+_DEFAULT_TEMPLATE = Path(__file__).parent.parent / "dataset_templates/alphapenger.yaml"
+
+try:
+    _DATASETS_DIR.mkdir(parents=True, exist_ok=True)
+except OSError:
+    pass  # read-only homes shouldn't break import; writes surface the error
+
 
 class palinorShell:
     """Interactive shell helper for palinor operations."""
 
-    def __init__(self, manager: palinorManager):
+    def __init__(self, manager: "palinorManager"):
         self.manager = manager
         self.datasets = {}  # Store created datasets
 
@@ -28,18 +58,14 @@ class palinorShell:
     ):
         """Create a new dataset of personality prompts."""
         if template_path is None:
-            template_path = str(
-                Path(__file__).parent.parent / "dataset_templates/alphapenger.yaml"
-            )
+            template_path = str(_DEFAULT_TEMPLATE)
 
         prompts = create_dataset.create_personality_prompts(
             template_path, a_trait, b_trait
         )
 
         # Save to ~/.palinor/datasets/
-        datasets_dir = Path.home() / ".palinor" / "datasets"
-        datasets_dir.mkdir(parents=True, exist_ok=True)
-        output_path = datasets_dir / f"{name}.jsonl"
+        output_path = _DATASETS_DIR / f"{name}.jsonl"
 
         create_dataset.save_prompts(prompts, str(output_path))
         self.datasets[name] = prompts
@@ -115,19 +141,16 @@ def cli():
 @click.option("--templates", "-t", type=click.Path(exists=True))
 def dataset(name: str, a_trait: str, b_trait: str, templates: Optional[str]) -> None:
     """Create a dataset of personality prompts."""
-    # Create datasets directory
-    datasets_dir = Path.home() / ".palinor" / "datasets"
-    datasets_dir.mkdir(parents=True, exist_ok=True)
-
-    template_path = (
-        templates or Path(__file__).parent.parent / "dataset_templates/alphapenger.yaml"
-    )
-    prompts = create_personality_prompts(str(template_path), a_trait, b_trait)
+    template_path = templates or _DEFAULT_TEMPLATE
 
-    # Save to ~/.palinor/datasets/
-    output_path = datasets_dir / f"{name}.jsonl"
-    save_prompts(prompts, str(output_path))
-    console.print(f"[green]Dataset saved to {output_path}[/green]")
+    # Save to ~/.palinor/datasets/, streaming entries straight to disk
+    output_path = _DATASETS_DIR / f"{name}.jsonl"
+    create_and_save(str(template_path), a_trait, b_trait, str(output_path))
+    if _IS_TTY:
+        console.print(f"[green]Dataset saved to {output_path}[/green]")
+    else:
+        # Paths are data and may legally contain brackets: emit them raw.
+        print(f"Dataset saved to {output_path}")
 
 
 @click.command()
@@ -140,10 +163,16 @@ def dataset(name: str, a_trait: str, b_trait: str, templates: Optional[str]) ->
 @click.option("--token", help="HuggingFace token for gated models")
 def train(name: str, a_trait: str, b_trait: str, model: str, token: Optional[str]):
     """Train a new control vector."""
+    from palinor.manager import palinorManager
+
     manager = palinorManager(model, hf_token=token)
     with console.status(f"Training vector '{name}' ({a_trait} vs {b_trait})..."):
         manager.train_vector(name, a_trait, b_trait)
-    console.print(f"[green]Vector {name} trained and saved![/green]")
+    if _IS_TTY:
+        console.print(f"[green]Vector {name} trained and saved![/green]")
+    else:
+        # Vector names are free-form data: emit them raw.
+        print(f"Vector {name} trained and saved!")
 
 
 @click.command()
@@ -162,10 +191,16 @@ def complete(
     token: Optional[str],
 ):
     """Generate text with optional vector control."""
+    from palinor.manager import palinorManager
+
     manager = palinorManager(model, hf_token=token)
     output = manager.generate(prompt, vector_name=vector, coeff=strength)
-    console.print("\n[bold]Generated text:[/bold]")
-    console.print(output)
+    _LOG("\n[bold]Generated text:[/bold]")
+    if _IS_TTY:
+        console.print(output)
+    else:
+        # Generated text is data, not markup: emit it untouched when piped.
+        print(output)
 
 
 @click.command()
@@ -174,14 +209,20 @@ def complete(
 )
 def list_vectors(model: str):
     """List available vectors for a model."""
+    from palinor.manager import palinorManager
+
     manager = palinorManager(model)
     vectors = manager.list_vectors()
     if vectors:
-        console.print("[bold]Available vectors:[/bold]")
+        _LOG("[bold]Available vectors:[/bold]")
         for vector in vectors:
-            console.print(f"  • {vector}")
+            if _IS_TTY:
+                console.print(f"  • {vector}")
+            else:
+                # Vector names are free-form data: emit them raw for scripts.
+                print(f"  • {vector}")
     else:
-        console.print("[yellow]No vectors found for this model[/yellow]")
+        _LOG("[yellow]No vectors found for this model[/yellow]")
 
 
 @click.command()
@@ -190,6 +231,9 @@ def list_vectors(model: str):
 )
 def shell(model: str):
     """Start a shell after initialising a manager."""
+    from IPython import start_ipython
+    from palinor.manager import palinorManager
+
     manager = palinorManager(model_name=model)
     shell_helper = palinorShell(manager)
 
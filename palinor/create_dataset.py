@@ -1,66 +1,239 @@
 """Create a dataset of polar prompts."""
 
+import functools
+import hashlib
+import itertools
 import json
-from typing import Any, Sequence
+import multiprocessing
+import pickle
+import warnings
+from typing import Any, Iterable, Iterator
 import yaml
 from pathlib import Path
 from .Message import DatasetEntry, Message
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a regular dependency
+    orjson = None
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # libyaml not available, fall back to the pure-Python parser
+    from yaml import SafeLoader as _YamlLoader
+
+    warnings.warn(
+        "PyYAML was built without libyaml; template parsing will be slow. "
+        "Reinstall PyYAML with libyaml support for faster loading.",
+        stacklevel=2,
+    )
+
+_TEMPLATE_CACHE_DIR = Path.home() / ".palinor" / "template_cache"
+
+
+def _template_cache_path(template_path: Path) -> Path:
+    """Sidecar cache path for a template, kept under ~/.palinor."""
+    digest = hashlib.blake2b(str(template_path).encode()).hexdigest()
+    return _TEMPLATE_CACHE_DIR / f"{digest}.pkl"
+
+
+def _resolve_template_path(file_path: str) -> Path:
+    """Resolve a template reference to an existing YAML file."""
+    # An existing path (absolute or relative) is used as-is
+    path = Path(file_path)
+    if path.is_file():
+        return path.resolve()
 
-def load_yaml_template(file_path: str) -> list[dict[str, Any]]:
-    """Load YAML template file."""
     # Get absolute paths
     package_dir = Path(__file__).parent.resolve()
     project_root = package_dir.parent.resolve()
 
-    # Remove any absolute path from file_path if present
-    file_path = Path(file_path).name
+    # Bare names fall back to the bundled template dirs
+    name = path.name
 
     # Try project root first since that's where the file actually is
-    template_path = project_root / "dataset_templates" / file_path
+    template_path = project_root / "dataset_templates" / name
 
     if not template_path.exists():
         # Fallback to package templates
-        template_path = package_dir / "templates" / file_path
+        template_path = package_dir / "templates" / name
 
         if not template_path.exists():
             msg = (
                 f"Template file not found. Tried:\n"
-                f"- Project templates: {template_path}\n"
-                f"- Package templates: {package_dir}/templates/{file_path}"
+                f"- Given path: {file_path}\n"
+                f"- Project templates: {project_root}/dataset_templates/{name}\n"
+                f"- Package templates: {package_dir}/templates/{name}"
             )
             raise FileNotFoundError(msg)
 
+    return template_path
+
+
+def load_yaml_template(file_path: str) -> list[dict[str, Any]]:
+    """Load YAML template file."""
+    template_path = _resolve_template_path(file_path)
+
+    # Templates are immutable between edits, so a parsed copy keyed on the
+    # source mtime lets repeat loads skip the YAML parse entirely.
+    cache_path = _template_cache_path(template_path)
+    if (
+        cache_path.exists()
+        and cache_path.stat().st_mtime >= template_path.stat().st_mtime
+    ):
+        try:
+            return pickle.loads(cache_path.read_bytes())
+        except Exception:
+            pass  # unreadable or corrupt cache, reparse below
+
     with open(template_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        data = yaml.load(f, Loader=_YamlLoader)
+
+    try:
+        _TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_bytes(pickle.dumps(data, protocol=5))
+    except OSError:
+        pass  # caching is best-effort; read-only homes shouldn't break loading
+
+    return data
+
 
+def load_templates(template_path: str) -> list[dict[str, Any]]:
+    """Load templates from a YAML file, or from every YAML file in a directory.
 
-def save_prompts(prompts: Sequence[DatasetEntry], output_path: str) -> None:
+    Directory parses are fanned out over a process pool when there are
+    enough files to amortize the pool startup, since YAML parsing is
+    GIL-bound CPU work that scales cleanly across files.
+    """
+    path = Path(template_path)
+    if not path.is_dir():
+        return load_yaml_template(template_path)
+
+    paths = [str(p) for p in sorted(path.glob("*.yaml"))]
+    if not paths:
+        raise FileNotFoundError(f"No .yaml templates found in {path}")
+
+    if len(paths) > 4:
+        with multiprocessing.Pool() as pool:
+            parsed = pool.map(load_yaml_template, paths)
+    else:
+        parsed = [load_yaml_template(p) for p in paths]
+    return list(itertools.chain.from_iterable(parsed))
+
+
+def save_prompts(prompts: Iterable[DatasetEntry], output_path: str) -> None:
     """Save prompts to a JSONL file."""
-    with open(output_path, "w", encoding="utf-8") as f:
-        for prompt in prompts:
-            f.write(json.dumps(prompt.to_dict()) + "\n")
+    if orjson is None:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(p.to_dict()) + "\n" for p in prompts)
+        return
+
+    if isinstance(prompts, (list, tuple)) and len(prompts) < 100_000:
+        # Already materialized and small: join everything into one buffer and
+        # write it with a single syscall instead of per-line writes.
+        if prompts:
+            buf = b"\n".join(orjson.dumps(p.to_dict()) for p in prompts) + b"\n"
+        else:
+            buf = b""
+        Path(output_path).write_bytes(buf)
+    else:
+        with open(output_path, "wb") as f:
+            f.writelines(orjson.dumps(p.to_dict()) + b"\n" for p in prompts)
+
+
+def _iter_entries(
+    templates: Iterable[dict[str, Any]],
+    a_adjective: str,
+    b_adjective: str,
+) -> Iterator[DatasetEntry]:
+    """Yield one DatasetEntry per user prompt across the given templates."""
+    for template in templates:
+        # Let the model's understanding of the personality traits control the
+        # style. Both sides see the same user message, so build it once and
+        # alias it; serialization never mutates messages. The comprehension
+        # builds each template's entries in one C-level list pass instead of
+        # per-entry append calls.
+        yield from [
+            DatasetEntry(
+                a=(msgs := [Message(role="user", content=user_prompt)]),
+                b=msgs,
+                a_trait=a_adjective,
+                b_trait=b_adjective,
+            )
+            for user_prompt in template["prompts"]
+        ]
+
+
+def _iter_personality_prompts(
+    template_path: str,
+    a_adjective: str,
+    b_adjective: str,
+) -> Iterator[DatasetEntry]:
+    """Yield prompts letting model personality control the style."""
+    yield from _iter_entries(load_templates(template_path), a_adjective, b_adjective)
+
+
+def _template_key(template_path: str) -> tuple[str, str]:
+    """Cache key for a template source: resolved path plus a freshness stamp.
+
+    For a directory the stamp hashes the sorted (name, mtime) pairs of its
+    YAML files, so adding, deleting, or renaming a file misses the cache
+    even when the newest mtime is unchanged.
+    """
+    path = Path(template_path)
+    if path.is_dir():
+        files = sorted((p.name, p.stat().st_mtime) for p in path.glob("*.yaml"))
+        stamp = hashlib.blake2b(repr(files).encode()).hexdigest()
+        return str(path.resolve()), stamp
+    resolved = _resolve_template_path(template_path)
+    return str(resolved), str(resolved.stat().st_mtime)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_prompts(
+    template_path: str,
+    stamp: str,
+    a_adjective: str,
+    b_adjective: str,
+) -> tuple[DatasetEntry, ...]:
+    """Build entries for a template source, memoized per trait pair.
+
+    stamp only participates in the cache key, so template edits miss the
+    cache naturally.
+    """
+    return tuple(_iter_entries(load_templates(template_path), a_adjective, b_adjective))
 
 
 def create_personality_prompts(
     template_path: str,
-    a_adjective: str, 
+    a_adjective: str,
     b_adjective: str,
 ) -> list[DatasetEntry]:
     """Create prompts letting model personality control the style."""
-    templates = load_yaml_template(template_path)
-    prompts = []
+    path, stamp = _template_key(template_path)
+    cached = _build_prompts(path, stamp, a_adjective, b_adjective)
+    # Return fresh entries (and message lists) so callers can't mutate the
+    # cached ones; the Message objects stay shared, as they are read-only
+    # everywhere.
+    return [
+        DatasetEntry(a=list(e.a), b=list(e.b), a_trait=e.a_trait, b_trait=e.b_trait)
+        for e in cached
+    ]
 
-    for template in templates:
-        user_prompts = template["prompts"]
-        
-        for user_prompt in user_prompts:
-            # Let the model's understanding of the personality traits control the style
-            entry = DatasetEntry(
-                a=[Message(role="user", content=user_prompt)],
-                b=[Message(role="user", content=user_prompt)],
-                a_trait=a_adjective,
-                b_trait=b_adjective
-            )
-            prompts.append(entry)
-    return prompts
\ No newline at end of file
+
+def create_and_save(
+    template_path: str,
+    a_adjective: str,
+    b_adjective: str,
+    output_path: str,
+) -> None:
+    """Create personality prompts and stream them straight to a JSONL file.
+
+    Unlike create_personality_prompts + save_prompts, this never
+    materializes the full entry list, so peak memory stays flat no matter
+    how large the template set is.
+    """
+    save_prompts(
+        _iter_personality_prompts(template_path, a_adjective, b_adjective),
+        output_path,
+    )
\ No newline at end of file